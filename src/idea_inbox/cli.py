@@ -7,6 +7,8 @@ Markdown files into the vault.
 
 State (v1): ./state/state.json (project-local)
 Vault (v1 default): ~/vault/ideas
+HTTP cache: ~/.cache/idea-inbox (refs/wiki responses; TTL in seconds via
+  IDEA_INBOX_CACHE_TTL, default 1 day, 0 disables)
 
 Commands:
   start         - start a pending capture (with expiry)
@@ -27,39 +29,68 @@ from __future__ import annotations
 import argparse
 import json
 import os
-import re
 import sys
 from dataclasses import dataclass
-from datetime import datetime, timedelta
+from datetime import datetime, timedelta, tzinfo
+from functools import lru_cache
 from pathlib import Path
 
-from idea_inbox.openalex import search as openalex_search
-from idea_inbox.wikipedia import search as wiki_search, summary as wiki_summary
-
 
 DEFAULT_TIMEOUT_SECONDS = 120
 DEFAULT_VAULT_DIR = Path.home() / "vault"
 DEFAULT_IDEAS_DIR = DEFAULT_VAULT_DIR / "ideas"
 
+_SLUG_KEEP = frozenset("abcdefghijklmnopqrstuvwxyz0123456789")
+
+
+@lru_cache(maxsize=None)
+def _local_tz() -> tzinfo | None:
+    # Resolved once per invocation; the local offset won't change under us.
+    return datetime.now().astimezone().tzinfo
+
 
 def now_local() -> datetime:
     # Local time with tz info if available
-    return datetime.now().astimezone()
+    return datetime.now(_local_tz())
 
 
 def iso(dt: datetime) -> str:
     return dt.isoformat(timespec="seconds")
 
 
+def _reached(at: datetime, until: str) -> bool:
+    """`at >= until` for an ISO timestamp written by iso(); unparsable counts as reached."""
+    at_iso = iso(at)
+    # Seconds-precision ISO strings with the same UTC offset sort lexically,
+    # so the common case needs no parsing.
+    if isinstance(until, str) and len(at_iso) == len(until) == 25 and at_iso[19:] == until[19:]:
+        return at_iso >= until
+    try:
+        until_dt = datetime.fromisoformat(until)
+    except Exception:
+        return True
+    return at >= until_dt
+
+
 def slugify(s: str, max_len: int = 60) -> str:
-    s = s.strip().lower()
-    # keep alnum, spaces, dash/underscore
-    s = re.sub(r"[^a-z0-9\s_-]+", "", s)
-    s = re.sub(r"[\s_]+", "-", s)
-    s = re.sub(r"-+", "-", s).strip("-")
+    # Single pass: keep ascii alnum, collapse runs of whitespace/dash/underscore
+    # into one "-" (never leading/trailing), drop everything else.
+    out: list[str] = []
+    sep = False
+    for c in s.lower():
+        if c in _SLUG_KEEP:
+            if sep and out:
+                out.append("-")
+            sep = False
+            out.append(c)
+        elif c == "-" or c == "_" or c.isspace():
+            sep = True
+    s = "".join(out)
     if not s:
         return "idea"
-    return s[:max_len].strip("-")
+    # s has no leading "-", so only a cut right after a separator needs trimming
+    s = s[:max_len]
+    return s.rstrip("-") if s.endswith("-") else s
 
 
 @dataclass
@@ -83,89 +114,73 @@ class State:
 
     @staticmethod
     def load(path: Path) -> "State":
-        if not path.exists():
-            return State()
+        # A missing file lands in the except branch too; no separate stat.
         try:
-            data = json.loads(path.read_text(encoding="utf-8"))
+            data = json.loads(path.read_bytes())
         except Exception:
             return State()
-        return State(
-            pending=bool(data.get("pending", False)),
-            pending_until=data.get("pending_until"),
-            started_at=data.get("started_at"),
-            user_id=data.get("user_id"),
-            last_file=data.get("last_file"),
-            last_idea_text=data.get("last_idea_text"),
-            enrich_pending=bool(data.get("enrich_pending", False)),
-            enrich_until=data.get("enrich_until"),
-            enrich_user_id=data.get("enrich_user_id"),
-            enrich_file=data.get("enrich_file"),
-            enrich_idea_text=data.get("enrich_idea_text"),
-        )
+        if not isinstance(data, dict):
+            return State()
+        # The dataclass fields are the on-disk schema; ignore unknown keys.
+        state = State(**{k: v for k, v in data.items() if k in State.__dataclass_fields__})
+        state.pending = bool(state.pending)
+        state.enrich_pending = bool(state.enrich_pending)
+        return state
 
     def save(self, path: Path) -> None:
         path.parent.mkdir(parents=True, exist_ok=True)
-        path.write_text(
-            json.dumps(
-                {
-                    "pending": self.pending,
-                    "pending_until": self.pending_until,
-                    "started_at": self.started_at,
-                    "user_id": self.user_id,
-                    "last_file": self.last_file,
-                    "last_idea_text": self.last_idea_text,
-                    "enrich_pending": self.enrich_pending,
-                    "enrich_until": self.enrich_until,
-                    "enrich_user_id": self.enrich_user_id,
-                    "enrich_file": self.enrich_file,
-                    "enrich_idea_text": self.enrich_idea_text,
-                },
-                ensure_ascii=False,
-                indent=2,
-            )
-            + "\n",
-            encoding="utf-8",
-        )
+        data = json.dumps(
+            vars(self),
+            ensure_ascii=False,
+            separators=(",", ":"),
+        ).encode("utf-8") + b"\n"
+        # Write the whole payload to a sibling file, then swap it in, so a
+        # killed process never leaves a truncated state.json behind. The tmp
+        # name is per-process so concurrent invocations don't share it.
+        tmp = path.with_name(f".{path.name}.{os.getpid()}.tmp")
+        try:
+            # write_bytes loops until the whole payload is written (os.write may not)
+            tmp.write_bytes(data)
+            os.replace(tmp, path)
+        except BaseException:
+            tmp.unlink(missing_ok=True)
+            raise
 
     def is_expired(self, at: datetime) -> bool:
         if not self.pending or not self.pending_until:
             return False
-        try:
-            until = datetime.fromisoformat(self.pending_until)
-        except Exception:
-            return True
-        return at >= until
+        return _reached(at, self.pending_until)
 
     def enrich_is_expired(self, at: datetime) -> bool:
         if not self.enrich_pending or not self.enrich_until:
             return False
-        try:
-            until = datetime.fromisoformat(self.enrich_until)
-        except Exception:
-            return True
-        return at >= until
+        return _reached(at, self.enrich_until)
 
 
-def ensure_not_expired(state: State, at: datetime) -> State:
+def ensure_not_expired(state: State, at: datetime) -> tuple[State, bool]:
+    """Clear expired pending flows; also report whether anything was cleared."""
+    changed = False
     if state.pending and state.is_expired(at):
+        changed = True
         state.pending = False
         state.pending_until = None
         state.started_at = None
         state.user_id = None
 
     if state.enrich_pending and state.enrich_is_expired(at):
+        changed = True
         state.enrich_pending = False
         state.enrich_until = None
         state.enrich_user_id = None
         state.enrich_file = None
         state.enrich_idea_text = None
 
-    return state
+    return state, changed
 
 
 def cmd_start(args: argparse.Namespace) -> int:
     state_path = Path(args.state)
-    state = ensure_not_expired(State.load(state_path), now_local())
+    state, _ = ensure_not_expired(State.load(state_path), now_local())
 
     # restart window if already pending
     started = now_local()
@@ -189,7 +204,7 @@ def cmd_cancel(args: argparse.Namespace) -> int:
     - enrichment clarifier pending
     """
     state_path = Path(args.state)
-    state = ensure_not_expired(State.load(state_path), now_local())
+    state, _ = ensure_not_expired(State.load(state_path), now_local())
 
     had_any = state.pending or state.enrich_pending
 
@@ -217,7 +232,7 @@ def cmd_cancel(args: argparse.Namespace) -> int:
 
 def cmd_enrich_start(args: argparse.Namespace) -> int:
     state_path = Path(args.state)
-    state = ensure_not_expired(State.load(state_path), now_local())
+    state, _ = ensure_not_expired(State.load(state_path), now_local())
 
     started = now_local()
     until = started + timedelta(seconds=args.timeout)
@@ -235,7 +250,7 @@ def cmd_enrich_start(args: argparse.Namespace) -> int:
 
 def cmd_enrich_cancel(args: argparse.Namespace) -> int:
     state_path = Path(args.state)
-    state = ensure_not_expired(State.load(state_path), now_local())
+    state, _ = ensure_not_expired(State.load(state_path), now_local())
     if not state.enrich_pending:
         print("OK no_enrich_pending")
         return 0
@@ -251,25 +266,23 @@ def cmd_enrich_cancel(args: argparse.Namespace) -> int:
 
 def cmd_refs(args: argparse.Namespace) -> int:
     # Fetch and print JSON refs (agent will format + add relevance text)
+    # Imported here so the state-only commands don't load the HTTP stack.
+    from idea_inbox.openalex import search as openalex_search
+
+    # basic filtering (done server-side): keep works with a DOI, avoid obvious books.
+    # Fetch a few extra since untitled records are still dropped client-side;
+    # OpenAlex accepts per-page 1..200.
     refs = openalex_search(
         args.query,
-        per_page=max(10, args.limit * 3),
+        per_page=min(200, max(1, args.limit) + 5),
         mailto=args.mailto,
         sort=args.sort,
         from_year=args.from_year,
+        filters=["type:!book", "type:!book-chapter", "has_doi:true"],
     )
 
-    # basic filtering: keep works with a venue OR a DOI/URL, and avoid obvious books
-    filtered = []
-    for r in refs:
-        if r.type in ("book", "book-chapter"):
-            continue
-        if not (r.doi or r.url or r.venue):
-            continue
-        filtered.append(r)
-
     out = []
-    for r in filtered[: args.limit]:
+    for r in refs[: max(0, args.limit)]:
         out.append(
             {
                 "title": r.title,
@@ -291,24 +304,32 @@ def cmd_append(args: argparse.Namespace) -> int:
     if not path.exists():
         print("ERR file_not_found")
         return 2
-    content = args.markdown
-    # Ensure a newline before appending
-    existing = path.read_text(encoding="utf-8")
-    sep = "\n" if not existing.endswith("\n") else ""
-    path.write_text(existing + sep + content.rstrip() + "\n", encoding="utf-8")
-    print("OK appended")
-    print(f"FILE {path}")
+    data = args.markdown.rstrip().encode("utf-8") + b"\n"
+    # Append in place (no rewrite of the existing content); only the last
+    # byte is read to decide whether a newline is needed first.
+    fd = os.open(str(path), os.O_RDWR | os.O_APPEND)
+    try:
+        size = os.fstat(fd).st_size
+        if size == 0 or os.pread(fd, 1, size - 1) != b"\n":
+            data = b"\n" + data
+        # os.write may write less than asked; keep going until it's all out
+        view = memoryview(data)
+        while view:
+            view = view[os.write(fd, view):]
+    finally:
+        os.close(fd)
+    sys.stdout.write(f"OK appended\nFILE {path}\n")
     return 0
 
 
 def cmd_wiki(args: argparse.Namespace) -> int:
-    # Best-effort: take top search result and return its summary.
-    candidates = wiki_search(args.query, limit=5)
-    if not candidates:
+    from idea_inbox.wikipedia import best_match as wiki_best_match
+
+    # Best-effort: top search result with its summary, in one round trip.
+    s = wiki_best_match(args.query)
+    if s is None:
         print(json.dumps({"query": args.query, "found": False}, ensure_ascii=False))
         return 0
-    best = candidates[0]
-    s = wiki_summary(best.title)
     print(
         json.dumps(
             {
@@ -326,49 +347,44 @@ def cmd_wiki(args: argparse.Namespace) -> int:
 
 def cmd_status(args: argparse.Namespace) -> int:
     state_path = Path(args.state)
-    state = ensure_not_expired(State.load(state_path), now_local())
+    state, changed = ensure_not_expired(State.load(state_path), now_local())
     # Persist expiry cleanup if needed
-    state.save(state_path)
+    if changed:
+        state.save(state_path)
 
-    print(f"CAPTURE_PENDING {str(state.pending).lower()}")
+    # Collect lines and emit them with one write
+    lines = [f"CAPTURE_PENDING {str(state.pending).lower()}"]
     if state.pending:
-        print(f"CAPTURE_STARTED_AT {state.started_at}")
-        print(f"CAPTURE_PENDING_UNTIL {state.pending_until}")
-        print(f"CAPTURE_USER_ID {state.user_id}")
+        lines.append(f"CAPTURE_STARTED_AT {state.started_at}")
+        lines.append(f"CAPTURE_PENDING_UNTIL {state.pending_until}")
+        lines.append(f"CAPTURE_USER_ID {state.user_id}")
 
-    print(f"ENRICH_PENDING {str(state.enrich_pending).lower()}")
+    lines.append(f"ENRICH_PENDING {str(state.enrich_pending).lower()}")
     if state.enrich_pending:
-        print(f"ENRICH_PENDING_UNTIL {state.enrich_until}")
-        print(f"ENRICH_USER_ID {state.enrich_user_id}")
-        print(f"ENRICH_FILE {state.enrich_file}")
+        lines.append(f"ENRICH_PENDING_UNTIL {state.enrich_until}")
+        lines.append(f"ENRICH_USER_ID {state.enrich_user_id}")
+        lines.append(f"ENRICH_FILE {state.enrich_file}")
 
     if state.last_file:
-        print(f"LAST_FILE {state.last_file}")
+        lines.append(f"LAST_FILE {state.last_file}")
     if state.last_idea_text:
-        print(f"LAST_IDEA_LEN {len(state.last_idea_text)}")
+        lines.append(f"LAST_IDEA_LEN {len(state.last_idea_text)}")
 
+    sys.stdout.write("\n".join(lines) + "\n")
     return 0
 
 
 def build_markdown(created: datetime, user_id: str, text: str, idea_id: str) -> str:
     # Minimal v1 frontmatter
-    fm = [
-        "---",
-        f"id: {idea_id}",
-        f"created: {iso(created)}",
-        "source: telegram",
-        "type: idea",
-        f"telegram_user_id: {user_id}",
-        "---",
-        "",
-    ]
-    body = text.rstrip() + "\n"
-    return "\n".join(fm) + body
+    return (
+        f"---\nid: {idea_id}\ncreated: {iso(created)}\nsource: telegram\n"
+        f"type: idea\ntelegram_user_id: {user_id}\n---\n{text.rstrip()}\n"
+    )
 
 
 def cmd_commit(args: argparse.Namespace) -> int:
     state_path = Path(args.state)
-    state = ensure_not_expired(State.load(state_path), now_local())
+    state, _ = ensure_not_expired(State.load(state_path), now_local())
 
     if not state.pending:
         print("ERR not_pending")
@@ -405,12 +421,13 @@ def cmd_commit(args: argparse.Namespace) -> int:
 
     state.save(state_path)
 
-    print("OK saved")
-    print(f"FILE {out_path}")
-    print(f"TITLE {title_basis.strip()[:120]}")
+    sys.stdout.write(f"OK saved\nFILE {out_path}\nTITLE {title_basis.strip()[:120]}\n")
     return 0
 
 
+_GLOBAL_FLAGS = {"--state": "state", "--ideas-dir": "ideas_dir"}
+
+
 def _extract_global_flags(argv: list[str]) -> tuple[dict[str, str], list[str]]:
     """Allow --state/--ideas-dir anywhere in argv (before or after subcommand).
 
@@ -418,12 +435,13 @@ def _extract_global_flags(argv: list[str]) -> tuple[dict[str, str], list[str]]:
     """
     out: dict[str, str] = {}
     rest: list[str] = []
-    it = iter(range(len(argv)))
     i = 0
-    while i < len(argv):
+    n = len(argv)
+    while i < n:
         a = argv[i]
-        if a in ("--state", "--ideas-dir") and i + 1 < len(argv):
-            out[a.lstrip("-").replace("-", "_")] = argv[i + 1]
+        key = _GLOBAL_FLAGS.get(a)
+        if key and i + 1 < n:
+            out[key] = argv[i + 1]
             i += 2
             continue
         rest.append(a)
@@ -431,15 +449,70 @@ def _extract_global_flags(argv: list[str]) -> tuple[dict[str, str], list[str]]:
     return out, rest
 
 
+def _default_state_path() -> str:
+    return str(Path(__file__).resolve().parents[2] / "state" / "state.json")
+
+
+# Hot commands handled without building the argparse parser:
+# cmd -> (handler, {flag: dest}, required dests)
+_FAST_COMMANDS = {
+    "status": (cmd_status, {}, ()),
+    "cancel": (cmd_cancel, {}, ()),
+    "start": (cmd_start, {"--user-id": "user_id", "--timeout": "timeout"}, ("user_id",)),
+    "commit": (cmd_commit, {"--user-id": "user_id", "--text": "text"}, ("user_id", "text")),
+}
+
+
+def _fast_args(argv: list[str], extracted: dict[str, str]) -> argparse.Namespace | None:
+    """Parse the common commands with a plain loop.
+
+    Returns None for anything out of the ordinary (other commands, --help,
+    unknown/abbreviated/--flag=value forms, missing or bad values) so that
+    argparse handles it, including its error messages.
+    """
+    if not argv or argv[0] not in _FAST_COMMANDS:
+        return None
+    cmd = argv[0]
+    func, flags, required = _FAST_COMMANDS[cmd]
+    values: dict[str, str] = {}
+    i = 1
+    n = len(argv)
+    while i < n:
+        dest = flags.get(argv[i])
+        if dest is None or i + 1 >= n:
+            return None
+        values[dest] = argv[i + 1]
+        i += 2
+    for dest in required:
+        if dest not in values:
+            return None
+
+    ns = argparse.Namespace(
+        state=extracted.get("state", _default_state_path()),
+        ideas_dir=extracted.get("ideas_dir", str(DEFAULT_IDEAS_DIR)),
+        cmd=cmd,
+        func=func,
+        **values,
+    )
+    if cmd == "start":
+        try:
+            ns.timeout = int(values.get("timeout", DEFAULT_TIMEOUT_SECONDS))
+        except ValueError:
+            return None
+    return ns
+
+
 def main(argv: list[str]) -> int:
     extracted, argv2 = _extract_global_flags(argv)
 
+    fast = _fast_args(argv2, extracted)
+    if fast is not None:
+        return fast.func(fast)
+
     p = argparse.ArgumentParser(prog="idea-inbox")
     p.add_argument(
         "--state",
-        default=extracted.get(
-            "state", str(Path(__file__).resolve().parents[2] / "state" / "state.json")
-        ),
+        default=extracted.get("state", _default_state_path()),
         help="Path to state JSON file",
     )
     p.add_argument(
@@ -0,0 +1,88 @@
+from __future__ import annotations
+
+import hashlib
+import json
+import os
+import tempfile
+import time
+import urllib.request
+from pathlib import Path
+from typing import Any
+
+
+USER_AGENT = "idea-inbox/0.1"
+
+# Successful responses are cached on disk, keyed by the full URL, so the
+# same lookup issued again (even from a later process) skips the network.
+DEFAULT_CACHE_TTL_SECONDS = 24 * 3600
+CACHE_DIR = Path(os.environ.get("XDG_CACHE_HOME") or Path.home() / ".cache") / "idea-inbox"
+
+
+def _download(url: str, timeout: float) -> bytes:
+    req = urllib.request.Request(url, headers={"User-Agent": USER_AGENT})
+    with urllib.request.urlopen(req, timeout=timeout) as resp:
+        return resp.read()
+
+
+def _cache_ttl() -> int:
+    # IDEA_INBOX_CACHE_TTL=0 disables the cache
+    try:
+        return int(os.environ.get("IDEA_INBOX_CACHE_TTL", DEFAULT_CACHE_TTL_SECONDS))
+    except ValueError:
+        return DEFAULT_CACHE_TTL_SECONDS
+
+
+def _prune(ttl: int) -> None:
+    # Drop entries (and stray temp files) older than the TTL; expired entries
+    # are otherwise only replaced if the exact same URL comes up again.
+    cutoff = time.time() - ttl
+    for pattern in ("*.json", "*.tmp"):
+        for p in CACHE_DIR.glob(pattern):
+            try:
+                if p.stat().st_mtime < cutoff:
+                    p.unlink()
+            except OSError:
+                pass
+
+
+def _store(path: Path, body: bytes) -> None:
+    fd, tmp = tempfile.mkstemp(dir=CACHE_DIR, suffix=".tmp")
+    try:
+        # a buffered file writes the whole body (a bare os.write may not)
+        with os.fdopen(fd, "wb") as f:
+            f.write(body)
+        os.replace(tmp, path)
+    except BaseException:
+        os.unlink(tmp)
+        raise
+
+
+def get_json(url: str, timeout: float = 20) -> Any:
+    """GET a URL with urllib.request.urlopen and return the decoded JSON.
+
+    Responses are served from the on-disk cache while younger than the TTL.
+    Only bodies that decode are cached, so a bad reply (proxy error page,
+    truncated body) raises once instead of being replayed until it expires.
+    """
+    ttl = _cache_ttl()
+    if ttl <= 0:
+        return json.loads(_download(url, timeout))
+
+    path = CACHE_DIR / (hashlib.sha1(url.encode("utf-8")).hexdigest() + ".json")
+    try:
+        if time.time() - path.stat().st_mtime < ttl:
+            return json.loads(path.read_bytes())
+    except (OSError, ValueError):
+        # missing, unreadable or corrupt entry: refetch over it
+        pass
+
+    body = _download(url, timeout)
+    data = json.loads(body)
+    # Best-effort: a cache that can't be written just means no cache.
+    try:
+        CACHE_DIR.mkdir(parents=True, exist_ok=True)
+        _store(path, body)
+        _prune(ttl)
+    except OSError:
+        pass
+    return data
@@ -1,17 +1,18 @@
 from __future__ import annotations
 
-import json
 import urllib.parse
-import urllib.request
-from dataclasses import dataclass
-from typing import Any
+from typing import NamedTuple
+
+from idea_inbox import net
 
 
 OPENALEX_WORKS = "https://api.openalex.org/works"
 
+# Only the Work fields `search` reads; keeps the response payload small.
+SELECT_FIELDS = ("title", "publication_year", "primary_location", "doi", "authorships", "type")
+
 
-@dataclass
-class Ref:
+class Ref(NamedTuple):
     title: str
     year: int | None
     venue: str | None
@@ -21,44 +22,33 @@ class Ref:
     type: str | None
 
 
-def _get(obj: dict[str, Any], path: str, default=None):
-    cur: Any = obj
-    for part in path.split("."):
-        if cur is None:
-            return default
-        if isinstance(cur, dict):
-            cur = cur.get(part)
-        else:
-            return default
-    return cur if cur is not None else default
-
-
 def search(
     query: str,
     per_page: int = 10,
     mailto: str | None = None,
     sort: str | None = None,
     from_year: int | None = None,
+    filters: list[str] | None = None,
 ) -> list[Ref]:
     params = {
         "search": query,
         "per-page": str(per_page),
+        "select": ",".join(SELECT_FIELDS),
     }
     if sort:
         # e.g. "publication_date:desc"
         params["sort"] = sort
+    # OpenAlex filter syntax, e.g. "type:!book"; comma-joined filters are ANDed
+    flt = list(filters or [])
     if from_year:
-        # OpenAlex filter syntax
-        params["filter"] = f"from_publication_date:{from_year}-01-01"
+        flt.append(f"from_publication_date:{from_year}-01-01")
+    if flt:
+        params["filter"] = ",".join(flt)
     if mailto:
         params["mailto"] = mailto
 
     url = OPENALEX_WORKS + "?" + urllib.parse.urlencode(params)
-    req = urllib.request.Request(url, headers={"User-Agent": "idea-inbox/0.1"})
-
-    with urllib.request.urlopen(req, timeout=20) as resp:
-        raw = resp.read().decode("utf-8")
-    data = json.loads(raw)
+    data = net.get_json(url, timeout=20)
 
     out: list[Ref] = []
     for w in data.get("results", []):
@@ -66,13 +56,15 @@ def search(
         if not title:
             continue
         year = w.get("publication_year")
-        venue = _get(w, "host_venue.display_name")
+        loc = w.get("primary_location") or {}
+        source = loc.get("source") or {}
+        venue = source.get("display_name")
         doi = w.get("doi")
-        url2 = _get(w, "primary_location.landing_page_url") or _get(w, "primary_location.source.homepage_url")
+        url2 = loc.get("landing_page_url") or source.get("homepage_url")
 
         authors: list[str] = []
         for a in w.get("authorships", [])[:5]:
-            name = _get(a, "author.display_name")
+            name = (a.get("author") or {}).get("display_name")
             if name:
                 authors.append(name)
 
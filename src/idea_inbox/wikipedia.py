@@ -1,10 +1,9 @@
 from __future__ import annotations
 
-import json
 import urllib.parse
-import urllib.request
-from dataclasses import dataclass
-from typing import Any
+from typing import Any, NamedTuple
+
+from idea_inbox import net
 
 
 def _get(obj: dict[str, Any], key: str, default=None):
@@ -12,55 +11,47 @@ def _get(obj: dict[str, Any], key: str, default=None):
     return default if v is None else v
 
 
-@dataclass
-class WikiResult:
+class WikiResult(NamedTuple):
     title: str
     url: str
     extract: str | None = None
 
 
-def search(query: str, limit: int = 5) -> list[WikiResult]:
-    """Return candidate Wikipedia pages for a query.
+def best_match(query: str) -> WikiResult | None:
+    """Top Wikipedia search hit for a query, with a short plain-text extract.
 
-    Uses MediaWiki API (en.wikipedia.org).
+    The search and the extract come back from a single MediaWiki request
+    (generator=search), so the lookup costs one round trip. The extract is
+    the first paragraph of the lead section, which roughly matches what the
+    REST page/summary endpoint returns.
     """
     params = {
         "action": "query",
-        "list": "search",
-        "srsearch": query,
+        "generator": "search",
+        "gsrsearch": query,
+        "gsrlimit": "1",
+        "prop": "extracts|info",
+        "exintro": "1",
+        "explaintext": "1",
+        "inprop": "url",
+        "redirects": "1",
         "format": "json",
+        "formatversion": "2",
         "utf8": "1",
-        "srlimit": str(limit),
     }
     url = "https://en.wikipedia.org/w/api.php?" + urllib.parse.urlencode(params)
-    req = urllib.request.Request(url, headers={"User-Agent": "idea-inbox/0.1"})
-    with urllib.request.urlopen(req, timeout=15) as resp:
-        data = json.loads(resp.read().decode("utf-8"))
-
-    results: list[WikiResult] = []
-    for item in _get(_get(data, "query", {}), "search", []) or []:
-        title = (item.get("title") or "").strip()
-        if not title:
-            continue
-        page_url = "https://en.wikipedia.org/wiki/" + urllib.parse.quote(title.replace(" ", "_"))
-        results.append(WikiResult(title=title, url=page_url))
-    return results
-
-
-def summary(title: str) -> WikiResult:
-    """Fetch a short summary for a title (REST API)."""
-    t = title.replace(" ", "_")
-    url = "https://en.wikipedia.org/api/rest_v1/page/summary/" + urllib.parse.quote(t)
-    req = urllib.request.Request(url, headers={"User-Agent": "idea-inbox/0.1"})
-    with urllib.request.urlopen(req, timeout=15) as resp:
-        data = json.loads(resp.read().decode("utf-8"))
-
-    page_title = (data.get("title") or title).strip()
-    extract = (data.get("extract") or "").strip() or None
-    page_url = None
-    content_urls = data.get("content_urls") or {}
-    desktop = content_urls.get("desktop") or {}
-    page_url = desktop.get("page")
+    data = net.get_json(url, timeout=15)
+
+    pages = _get(_get(data, "query", {}), "pages", []) or []
+    if not pages:
+        return None
+    page = pages[0]
+    page_title = (page.get("title") or "").strip()
+    if not page_title:
+        return None
+    # exintro returns the whole lead section; keep only its first paragraph
+    extract = (page.get("extract") or "").strip().split("\n", 1)[0].strip() or None
+    page_url = page.get("fullurl")
     if not page_url:
         page_url = "https://en.wikipedia.org/wiki/" + urllib.parse.quote(page_title.replace(" ", "_"))
 